@@ -1,56 +1,90 @@
-from pdf2image import convert_from_bytes
-from pypdf import PdfWriter, PdfReader
 import io
 import argparse
+import functools
 import zipfile
+from typing import BinaryIO, Callable, NamedTuple
 import os
-import xml.etree.ElementTree as ET
-import mimetypes
-from ebooklib import epub
+import shutil
 from PIL import Image, ImageDraw, ImageFont
-import textwrap
 
 
-# Set up command-line argument parser
-parser = argparse.ArgumentParser(
-    description='Extract cover photo from PDF, EPUB, or TXT file.')
-parser.add_argument('input_files',
-                    type=str,
-                    nargs='+',
-                    help='PDF/EPUB/TXT file names to extract cover photos or render text covers from')
-parser.add_argument('--type',
-                    type=str,
-                    choices=['pdf', 'epub', 'txt'],
-                    required=False,
-                    help='Optional file type hint: pdf, epub, or txt')
-args = parser.parse_args()
+# XML parse function plus the element lookups the EPUB helpers need.
+class _XmlBackend(NamedTuple):
+    parse: Callable
+    rootfile: Callable
+    manifest_items: Callable
+    meta: Callable
+
+
+# Prefer libxml2-backed lxml for OPF/container parsing; stdlib ElementTree otherwise.
+# Imported on first EPUB (like pdf2image and EbookLib in their extractors) so a
+# run over another file type does not pay for it.
+@functools.lru_cache(maxsize=None)
+def _xml_backend() -> _XmlBackend:
+    """Return the XML parse function and the rootfile/manifest item/meta lookups."""
+    try:
+        import lxml.etree as LET
+    except ImportError:
+        import xml.etree.ElementTree as ET
+        return _XmlBackend(
+            parse=ET.fromstring,
+            rootfile=lambda root: root.findall('.//{*}rootfile'),
+            manifest_items=lambda root: root.findall('.//{*}manifest/{*}item'),
+            meta=lambda root: root.findall('.//{*}metadata/{*}meta'))
+
+    # Never resolve entities or touch the network for XML taken from uploaded files
+    parser = LET.XMLParser(resolve_entities=False, no_network=True)
+    return _XmlBackend(
+        parse=functools.partial(LET.fromstring, parser=parser),
+        rootfile=LET.XPath('//*[local-name()="rootfile"]'),
+        manifest_items=LET.XPath('//*[local-name()="manifest"]/*[local-name()="item"]'),
+        meta=LET.XPath('//*[local-name()="metadata"]/*[local-name()="meta"]'))
+
+
+# Output extensions for the image types EPUBs actually use; avoids loading the
+# system MIME database through mimetypes just to name a raw-bytes fallback
+_MIME_EXT = {
+    'image/jpeg': '.jpg',
+    'image/png': '.png',
+    'image/gif': '.gif',
+    'image/webp': '.webp',
+    'image/svg+xml': '.svg',
+    'image/bmp': '.bmp',
+    'image/tiff': '.tiff',
+}
+
+# Default font and a scratch draw context for measuring text, set up once
+# rather than per TXT file
+_DEFAULT_FONT = ImageFont.load_default()
+_MEASURE_DRAW = ImageDraw.Draw(Image.new('RGB', (1, 1)))
 
 
 # Get rootfile path from container.xml in EPUB.
 def _get_rootfile_path(zipf: zipfile.ZipFile) -> str:
     """Return path to the package document (OPF) from container.xml."""
-    try:
-        container = zipf.read('META-INF/container.xml')
-    except KeyError:
+    info = zipf.NameToInfo.get('META-INF/container.xml')
+    if info is None:
         raise ValueError('Invalid EPUB: missing META-INF/container.xml')
-    root = ET.fromstring(container)
-    # container.xml typically uses no namespace for rootfiles/rootfile
-    rootfile = root.find('.//{*}rootfile')
-    if rootfile is None:
-        # Try without namespace
-        rootfile = root.find('.//rootfile')
+    container = zipf.read(info)
+    backend = _xml_backend()
+    root = backend.parse(container)
+    # Matches rootfile with or without the container namespace
+    rootfiles = backend.rootfile(root)
+    rootfile = rootfiles[0] if rootfiles else None
     if rootfile is None or 'full-path' not in rootfile.attrib:
         raise ValueError('Invalid EPUB: could not find rootfile in container.xml')
     return rootfile.attrib['full-path']
 
 
-# Helper to handle XML namespaces
-def _ns_tag(tag: str, ns: str):
-    return f'{{{ns}}}{tag}' if ns else tag
-
 # Parse OPF data to find cover image href.
 def _find_cover_href(opf_data: bytes, rootfile_dir: str) -> str | None:
-    """Parse OPF data and return the href of the cover image if found.
+    """Parse OPF data and return the href of the cover image if found."""
+    return _find_cover_href_from_tree(_xml_backend().parse(opf_data), rootfile_dir)
+
+
+# Find cover image href in an already parsed OPF tree.
+def _find_cover_href_from_tree(tree, rootfile_dir: str) -> str | None:
+    """Return the href of the cover image in a parsed OPF root element, if found.
 
     Strategy (in order):
     - Look for <meta name="cover" content="cover-id"/> and find manifest item with that id
@@ -58,51 +92,196 @@ def _find_cover_href(opf_data: bytes, rootfile_dir: str) -> str | None:
     - Look for manifest image items with 'cover' in the id or href
     - Fallback to the first image/* item in the manifest
     """
-    tree = ET.fromstring(opf_data)
-    # detect namespace (if any)
-    ns = ''
-    if tree.tag.startswith('{'):
-        ns = tree.tag.split('}')[0].strip('{')
-
-    # Build manifest map: id -> (href, media-type, properties)
-    manifest = {}
-    for item in tree.findall('.//' + _ns_tag('manifest', ns) + '/' + _ns_tag('item', ns)):
+    backend = _xml_backend()
+
+    # <meta name="cover" content="id"/> ids in metadata order; the earliest one
+    # present in the manifest wins outright
+    cover_ids = {}
+    for meta in backend.meta(tree):
+        content = meta.attrib.get('content')
+        if content and meta.attrib.get('name', '').lower() == 'cover':
+            cover_ids.setdefault(content, len(cover_ids))
+
+    # Single pass over the manifest keeping the best candidate so far
+    # (meta cover by metadata rank, then 1 = cover-image property,
+    # 2 = 'cover' in id/href, 3 = first image)
+    meta_rank, meta_href = len(cover_ids), None
+    best_priority, best_href = 4, None
+    for item in backend.manifest_items(tree):
         iid = item.attrib.get('id')
         href = item.attrib.get('href')
+        if not (iid and href):
+            continue
+        rank = cover_ids.get(iid)
+        if rank is not None:
+            if rank < meta_rank:
+                meta_rank, meta_href = rank, href
+            if rank == 0:
+                # The first meta cover cannot be beaten
+                break
+            continue
+        if meta_href is not None or best_priority <= 1:
+            if not cover_ids:
+                break
+            continue
         mtype = item.attrib.get('media-type', '')
-        props = item.attrib.get('properties', '')
-        if iid and href:
-            manifest[iid] = (href, mtype, props)
-
-    # 1) <meta name="cover" content="id"/>
-    for meta in tree.findall('.//' + _ns_tag('metadata', ns) + '/' + _ns_tag('meta', ns)):
-        if meta.attrib.get('name', '').lower() == 'cover':
-            cover_id = meta.attrib.get('content')
-            if cover_id and cover_id in manifest:
-                return os.path.normpath(os.path.join(rootfile_dir, manifest[cover_id][0]))
-
-    # 2) manifest item with properties containing 'cover-image'
-    for iid, (href, mtype, props) in manifest.items():
-        if 'cover-image' in props:
-            return os.path.normpath(os.path.join(rootfile_dir, href))
-
-    # 3) look for 'cover' in id or href
-    for iid, (href, mtype, props) in manifest.items():
-        if mtype.startswith('image/') and ('cover' in (iid or '').lower() or 'cover' in href.lower()):
-            return os.path.normpath(os.path.join(rootfile_dir, href))
-
-    # 4) first image/*
-    for iid, (href, mtype, props) in manifest.items():
-        if mtype.startswith('image/'):
-            return os.path.normpath(os.path.join(rootfile_dir, href))
+        if 'cover-image' in item.attrib.get('properties', ''):
+            priority = 1
+        elif mtype.startswith('image/'):
+            priority = 2 if ('cover' in iid.lower() or 'cover' in href.lower()) else 3
+        else:
+            continue
+        if priority < best_priority:
+            best_priority, best_href = priority, href
+
+    if meta_href is not None:
+        best_href = meta_href
+    if best_href is None:
+        return None
+    return os.path.normpath(os.path.join(rootfile_dir, best_href))
+
+# Output path next to the input, refusing to overwrite the input itself.
+def _output_path(input_file: str, ext: str) -> str:
+    output_file = os.path.splitext(input_file)[0] + ext
+    same = os.path.normcase(os.path.abspath(output_file)) == os.path.normcase(os.path.abspath(input_file))
+    if not same and os.path.exists(output_file):
+        same = os.path.samefile(output_file, input_file)
+    if same:
+        raise ValueError(f'refusing to overwrite input file {input_file} with its cover')
+    return output_file
+
+
+# Render first page of PDF as PNG.
+def extract_pdf_cover(input_file: str) -> None:
+    print(f"Extracting cover photo from {input_file}...")
 
-    return None
+    try:
+        from pdf2image import convert_from_path
 
-# Extract cover images from EPUB as PNG.
-def extract_epub_cover(input_file: str) -> None:
+        # Resolve the output path first so a bad input is rejected before rasterising
+        output_file = _output_path(input_file, '.png')
+
+        # Rasterise only the first page; Poppler reads the file itself and skips the
+        # rest of the document. Raw PPM over the pipe avoids a PNG encode in pdftoppm
+        # plus a decode here before the single encode below.
+        images = convert_from_path(input_file, first_page=1, last_page=1,
+                                   dpi=150, fmt='ppm', single_file=True)
+        images[0].save(output_file, 'PNG', compress_level=1)
+
+        # Print the output path to stdout so callers can consume it if needed
+        try:
+            print(output_file)
+        except Exception:
+            pass
+
+        # Print confirmation message
+        print(f"Done, your cover photo has been saved as {output_file}")
+    except Exception as e:
+        print(f'Error extracting PDF cover from {input_file}: {e}')
+
+
+# Save an EPUB cover stream next to the book, re-encoding to PNG only when needed.
+def _save_cover(fp: BinaryIO, input_file: str, max_size: tuple[int, int] | None) -> str:
+    """Write the cover read from a seekable binary stream and return the output path.
+
+    PNG and RGB/greyscale JPEG covers that already fit max_size are copied
+    byte-for-byte; anything else is decoded (scaled down) and saved as PNG.
+    """
+    head = fp.read(8)
+    fp.seek(0)
+    if head == b'\x89PNG\r\n\x1a\n':
+        raw_ext = '.png'
+    elif head[:3] == b'\xff\xd8\xff':
+        raw_ext = '.jpg'
+    else:
+        raw_ext = None
+
+    # Image.open only parses the header; pixels are pulled from fp as they decode
+    img = Image.open(fp)
+    if raw_ext and (raw_ext == '.png' or img.mode in ('RGB', 'L')) and (
+            not max_size or (img.width <= max_size[0] and img.height <= max_size[1])):
+        output_file = _output_path(input_file, raw_ext)
+        fp.seek(0)
+        with open(output_file, 'wb') as out:
+            shutil.copyfileobj(fp, out)
+        return output_file
+
+    if max_size:
+        # Let libjpeg decode at 1/2, 1/4 or 1/8 scale; no-op for other formats
+        img.draft('RGB', max_size)
+        if img.mode == 'P' and (img.width > max_size[0] or img.height > max_size[1]):
+            # Palette images are resized nearest-neighbour; scale them in RGB(A)
+            img = img.convert('RGBA' if 'transparency' in img.info else 'RGB')
+        img.thumbnail(max_size, Image.LANCZOS)
+    img.load()
+    # PNG stores these modes natively; only convert the rest (e.g. CMYK)
+    if img.mode not in ('RGB', 'RGBA', 'L', 'LA', 'P', '1'):
+        img = img.convert('RGBA')
+    output_file = _output_path(input_file, '.png')
+    img.save(output_file, 'PNG', compress_level=1)
+    return output_file
+
+
+# Extract cover images from EPUB as PNG (or the original PNG/JPEG bytes).
+def extract_epub_cover(input_file: str, max_size: tuple[int, int] | None = (800, 1200)) -> None:
+    """Extract an EPUB's cover image and save it next to the EPUB.
+
+    - max_size: bounding box the cover is scaled down to; None keeps full resolution
+    """
     print(f"Extracting cover photo from {input_file}...")
-    # Try EbookLib first for robustness
+    # Read only container.xml, the OPF and the cover image straight from the zip
     try:
+        with zipfile.ZipFile(input_file, 'r') as z:
+            # Members are resolved through the ZipFile's own index built on open;
+            # the same handle serves container.xml, the OPF and the image
+            rootfile_path = _get_rootfile_path(z)
+            rootfile_dir = os.path.dirname(rootfile_path)
+            opf_info = z.NameToInfo.get(rootfile_path)
+            if opf_info is None:
+                raise ValueError(f'Invalid EPUB: missing package document {rootfile_path}')
+            # Parse the OPF once; the tree is what later lookups work from
+            opf_tree = _xml_backend().parse(z.read(opf_info))
+
+            cover_href = _find_cover_href_from_tree(opf_tree, rootfile_dir)
+            if not cover_href:
+                raise ValueError('cover image not found in EPUB manifest')
+
+            # Normalize path inside zip (OPF hrefs are relative)
+            cover_href = cover_href.replace('\\', '/')
+            info = z.NameToInfo.get(cover_href)
+            if info is None:
+                # Sometimes href is given without the root path; try basename
+                basename_map = {os.path.basename(n).lower(): n for n in z.namelist()}
+                hit = basename_map.get(os.path.basename(cover_href).lower())
+                if hit:
+                    info = z.NameToInfo[hit]
+                    cover_href = hit
+                if info is None:
+                    raise ValueError(f'could not read cover image {cover_href} from EPUB')
+
+            # Stream the image out of the zip; copy PNG/JPEG as-is when they fit,
+            # otherwise convert to PNG
+            try:
+                with z.open(info) as fp:
+                    output_file = _save_cover(fp, input_file, max_size)
+                print(f"Done, your cover photo has been saved as {output_file}")
+                return
+            except Exception as e:
+                # fallback: write raw bytes with original extension
+                ext = os.path.splitext(cover_href)[1] or '.img'
+                output_file = _output_path(input_file, ext)
+                with z.open(info) as fp, open(output_file, 'wb') as out:
+                    shutil.copyfileobj(fp, out)
+                print(f"Done, your cover photo has been saved as {output_file} (raw bytes)")
+                return
+    except Exception as e:
+        # OPF parsing failed; fall back to a full EbookLib parse
+        print(f'Zip parsing failed, falling back to EbookLib: {e}')
+
+    # Fallback: EbookLib inflates the whole book, so only use it when the OPF route fails
+    try:
+        from ebooklib import epub
+
         book = epub.read_epub(input_file)
         cover_item = None
 
@@ -136,14 +315,9 @@ def extract_epub_cover(input_file: str) -> None:
             if data is None:
                 raise ValueError('Could not read image bytes from EbookLib item')
 
-            # Convert whatever image bytes we have to PNG for consistency
+            # Copy PNG/JPEG bytes as-is when they fit, otherwise convert to PNG
             try:
-                img = Image.open(io.BytesIO(data))
-                # Ensure mode is compatible with PNG
-                if img.mode not in ('RGB', 'RGBA'):
-                    img = img.convert('RGBA')
-                output_file = os.path.splitext(input_file)[0] + '.png'
-                img.save(output_file, format='PNG')
+                output_file = _save_cover(io.BytesIO(data), input_file, max_size)
                 print(f"Done, your cover photo has been saved as {output_file}")
                 return
             except Exception as e:
@@ -151,65 +325,53 @@ def extract_epub_cover(input_file: str) -> None:
                 name = getattr(cover_item, 'file_name', None) or (getattr(cover_item, 'get_name', lambda: None)() if hasattr(cover_item, 'get_name') else None) or getattr(cover_item, 'id', 'cover')
                 ext = os.path.splitext(name)[1]
                 if not ext:
-                    ext = mimetypes.guess_extension(getattr(cover_item, 'media_type', '')) or '.img'
-                output_file = os.path.splitext(input_file)[0] + ext
+                    ext = _MIME_EXT.get(getattr(cover_item, 'media_type', ''), '.img')
+                output_file = _output_path(input_file, ext)
                 with open(output_file, 'wb') as out:
                     out.write(data)
                 print(f"Done, your cover photo has been saved as {output_file} (raw bytes)")
                 return
+        print('Cover image not found in EPUB.')
     except Exception as e:
-        # EbookLib failed; fall back to stdlib parsing
-        # print a short debug message then try fallback
-        print(f'EbookLib extraction failed, falling back to zip parsing: {e}')
-
-    # Fallback: use zip/OPF parsing
-    try:
-        with zipfile.ZipFile(input_file, 'r') as z:
-            rootfile_path = _get_rootfile_path(z)
-            rootfile_dir = os.path.dirname(rootfile_path)
-            opf_data = z.read(rootfile_path)
+        print(f'Error extracting EPUB cover from {input_file}: {e}')
 
-            cover_href = _find_cover_href(opf_data, rootfile_dir)
-            if not cover_href:
-                print('Cover image not found in EPUB manifest.')
-                return
 
-            # Normalize path inside zip (OPF hrefs are relative)
-            cover_href = cover_href.replace('\\', '/')
-            try:
-                image_data = z.read(cover_href)
-            except KeyError:
-                # Sometimes href is given without the root path; try basename
-                image_data = None
-                for name in z.namelist():
-                    if name.lower().endswith(os.path.basename(cover_href).lower()):
-                        image_data = z.read(name)
-                        cover_href = name
-                        break
-                if image_data is None:
-                    print(f'Could not read cover image {cover_href} from EPUB.')
-                    return
-
-            # Try to open image bytes with PIL and save as PNG for consistency
-            try:
-                img = Image.open(io.BytesIO(image_data))
-                if img.mode not in ('RGB', 'RGBA'):
-                    img = img.convert('RGBA')
-                output_file = os.path.splitext(input_file)[0] + '.png'
-                img.save(output_file, format='PNG')
-                print(f"Done, your cover photo has been saved as {output_file}")
-            except Exception as e:
-                # fallback: write raw bytes with original extension
-                ext = os.path.splitext(cover_href)[1]
-                if not ext:
-                    mtype = mimetypes.guess_type(cover_href)[0]
-                    ext = mimetypes.guess_extension(mtype) or '.img'
-                output_file = os.path.splitext(input_file)[0] + ext
-                with open(output_file, 'wb') as out:
-                    out.write(image_data)
-                print(f"Done, your cover photo has been saved as {output_file} (raw bytes)")
-    except Exception as e:
-        print(f'Error extracting EPUB cover from {input_file}: {e}')
+# Greedy word wrap measured with the real (proportional) font.
+def _wrap_text(draw: ImageDraw.ImageDraw, text: str, font, max_w: int) -> list[str]:
+    # Measure each word once and keep a running line width rather than
+    # re-measuring the whole candidate line for every word
+    space_w = draw.textlength(' ', font=font)
+    lines = []
+    cur = ''
+    cur_w = 0.0
+    for word in text.split():
+        word_w = draw.textlength(word, font=font)
+        if cur and cur_w + space_w + word_w <= max_w:
+            cur += ' ' + word
+            cur_w += space_w + word_w
+            continue
+        if not cur and word_w <= max_w:
+            cur, cur_w = word, word_w
+            continue
+        if cur:
+            lines.append(cur)
+        # Break words wider than a line (long URLs, hashes, unspaced CJK text)
+        # at the longest prefix that fits, found by bisecting on character count
+        while len(word) > 1 and word_w > max_w:
+            lo, hi = 1, len(word) - 1
+            while lo < hi:
+                mid = (lo + hi + 1) // 2
+                if draw.textlength(word[:mid], font=font) <= max_w:
+                    lo = mid
+                else:
+                    hi = mid - 1
+            lines.append(word[:lo])
+            word = word[lo:]
+            word_w = draw.textlength(word, font=font)
+        cur, cur_w = word, word_w
+    if cur:
+        lines.append(cur)
+    return lines
 
 
 # Render first lines of TXT file into PNG image.
@@ -221,13 +383,17 @@ def extract_txt_cover(input_file: str, max_lines: int = 20, max_chars: int = 200
     """
     print(f"Creating text cover image from {input_file}...")
     try:
-        with open(input_file, 'r', encoding='utf-8', errors='ignore') as f:
-            lines = []
-            for _ in range(max_lines):
-                line = f.readline()
-                if not line:
-                    break
-                lines.append(line.rstrip('\n'))
+        # One bulk read is enough: max_chars characters span at most 4 bytes each
+        with open(input_file, 'rb') as f:
+            raw = f.read(min(max_chars * 4, 1 << 20))
+        # Split on '\n' only (splitlines() would also break on form feeds etc.)
+        lines = raw.decode('utf-8', errors='ignore').split('\n', max_lines)
+        if len(lines) > max_lines:
+            del lines[max_lines:]
+        elif not lines[-1]:
+            # Text ended with a newline (or the file is empty)
+            lines.pop()
+        lines = [line[:-1] if line.endswith('\r') else line for line in lines]
 
         if not lines:
             print('TXT file is empty; no cover created.')
@@ -238,83 +404,93 @@ def extract_txt_cover(input_file: str, max_lines: int = 20, max_chars: int = 200
             text = text[:max_chars].rstrip() + '...'
 
         # Choose image size and font
-        font = ImageFont.load_default()
+        font = _DEFAULT_FONT
         # Base width; will wrap text to fit
         width = 1200
         margin = 40
 
-        # Estimate characters per line based on font metrics
-        # Use a temporary draw to measure text size (compatible across Pillow versions)
-        temp_img = Image.new('RGB', (1, 1))
-        temp_draw = ImageDraw.Draw(temp_img)
-        try:
-            avg_char_w, char_h = temp_draw.textsize('A', font=font)
-        except AttributeError:
-            # Pillow >=8: use textbbox
-            bbox = temp_draw.textbbox((0, 0), 'A', font=font)
-            avg_char_w = bbox[2] - bbox[0]
-            char_h = bbox[3] - bbox[1]
-        avg_char_w = avg_char_w or 7
-        chars_per_line = max(40, (width - 2 * margin) // avg_char_w)
-
-        wrapped = textwrap.fill(text, width=chars_per_line)
-        lines = wrapped.splitlines()
+        # Wrap each paragraph to the usable width, keeping blank lines
+        lines = []
+        for paragraph in text.split('\n'):
+            lines.extend(_wrap_text(_MEASURE_DRAW, paragraph, font, width - 2 * margin) or [''])
 
-        line_height = char_h + 6
-        height = margin * 2 + line_height * max(1, len(lines))
+        # Lay the whole block out in one call and size the image to fit it exactly
+        block = '\n'.join(lines)
+        bottom = _MEASURE_DRAW.multiline_textbbox((0, 0), block, font=font, spacing=6)[3]
+        height = margin * 2 + bottom
 
         img = Image.new('RGBA', (width, height), 'white')
         draw = ImageDraw.Draw(img)
+        draw.multiline_text((margin, margin), block, fill='black', font=font, spacing=6)
 
-        y = margin
-        for line in lines:
-            draw.text((margin, y), line, fill='black', font=font)
-            y += line_height
-
-        output_file = os.path.splitext(input_file)[0] + '.png'
-        img.save(output_file)
+        output_file = _output_path(input_file, '.png')
+        img.save(output_file, 'PNG', compress_level=1)
         print(f"Done, your text cover has been saved as {output_file}")
     except Exception as e:
         print(f'Error creating TXT cover from {input_file}: {e}')
 
 
-# Loop over input files
-for input_file in args.input_files:
-    ext = os.path.splitext(input_file)[1].lower()
-    if ext == '.pdf':
-        print(f"Extracting cover photo from {input_file}...")
-
-        # Open input PDF file and extract first page
-        pdf_reader = PdfReader(input_file)
-        first_page = pdf_reader.pages[0]
-
-        # Create output PDF writer and add first page
-        pdf_writer = PdfWriter()
-        pdf_writer.add_page(first_page)
-
-        # Write output PDF data to memory buffer
-        buffer = io.BytesIO()
-        pdf_writer.write(buffer)
-
-        # Convert output PDF data to image and save as PNG file
-        images = convert_from_bytes(buffer.getvalue())
-        output_file = os.path.splitext(input_file)[0] + ".png"
-        images[0].save(output_file)
-
-        # Print the output path to stdout so callers can consume it if needed
-        try:
-            print(output_file)
-        except Exception:
-            pass
+# Identify a file by its leading bytes rather than its name.
+def _sniff(input_file: str) -> str | None:
+    """Return 'pdf', 'epub' or 'zip' from the file signature, or None if unrecognised."""
+    with open(input_file, 'rb') as f:
+        head = f.read(64)
+    if head[:4] == b'%PDF':
+        return 'pdf'
+    if head[:4] == b'PK\x03\x04':
+        # OCF stores the uncompressed 'mimetype' entry first in the archive
+        return 'epub' if b'mimetypeapplication/epub+zip' in head else 'zip'
+    return None
 
-        # Print confirmation message
-        print(f"Done, your cover photo has been saved as {output_file}")
 
-        # Close memory buffer
-        buffer.close()
-    elif ext == '.epub':
+# Pick the extractor for a single input file by signature; extension/--type break ties.
+def _dispatch(input_file: str, type_hint: str | None = None) -> None:
+    try:
+        kind = _sniff(input_file)
+    except OSError as e:
+        print(f'Error reading {input_file}: {e}')
+        return
+    hint = type_hint or {'.pdf': 'pdf', '.epub': 'epub', '.txt': 'txt'}.get(
+        os.path.splitext(input_file)[1].lower())
+    if kind == 'zip':
+        # Not every packager writes 'mimetype' first; trust the hint for plain zips
+        kind = 'epub' if hint == 'epub' else None
+    elif kind is None:
+        # No known signature: only go by an explicit hint or extension, never guess
+        kind = hint
+
+    if kind == 'pdf':
+        extract_pdf_cover(input_file)
+    elif kind == 'epub':
         extract_epub_cover(input_file)
-    elif ext == '.txt':
+    elif kind == 'txt':
         extract_txt_cover(input_file)
     else:
-        print(f'Unsupported file type for {input_file}; supported: .pdf, .epub')
+        print(f'Unsupported file type for {input_file}; supported: .pdf, .epub, .txt')
+
+
+if __name__ == '__main__':
+    # Set up command-line argument parser
+    parser = argparse.ArgumentParser(
+        description='Extract cover photo from PDF, EPUB, or TXT file.')
+    parser.add_argument('input_files',
+                        type=str,
+                        nargs='+',
+                        help='PDF/EPUB/TXT file names to extract cover photos or render text covers from')
+    parser.add_argument('--type',
+                        type=str,
+                        choices=['pdf', 'epub', 'txt'],
+                        required=False,
+                        help='Optional file type hint: pdf, epub, or txt')
+    args = parser.parse_args()
+
+    if len(args.input_files) == 1:
+        # Single file (the server's case): a worker pool would only add startup cost
+        _dispatch(args.input_files[0], args.type)
+    else:
+        # Files are independent; spread the batch across CPU cores
+        workers = min(os.cpu_count() or 1, len(args.input_files))
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            list(ex.map(_dispatch, args.input_files, [args.type] * len(args.input_files)))